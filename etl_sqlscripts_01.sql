@@ -22,9 +22,10 @@
 
 -- -----------------------------------------------------
 -- Create the initial staging table for raw company data
--- This table will hold LinkedIn data before transformation
+-- This table will hold LinkedIn data before transformation; it is
+-- normally already created and filled by the Pentaho staging load
 -- -----------------------------------------------------
-CREATE TABLE company_raw (
+CREATE TABLE IF NOT EXISTS company_raw (
     linkedin_internal_id VARCHAR(255),
     description TEXT,
     website VARCHAR(255),
@@ -61,12 +62,11 @@ ALTER TABLE company_raw RENAME TO company;
 
 -- -----------------------------------------------------
 -- Add primary key and additional columns for data normalization
+-- Combined into one ALTER so the table is rebuilt only once; the
+-- company_size_min/max columns store values parsed from JSON
 -- -----------------------------------------------------
 ALTER TABLE company
-  ADD COLUMN company_id INT AUTO_INCREMENT PRIMARY KEY FIRST;
-
--- Add columns to store min/max company size values parsed from JSON
-ALTER TABLE company
+ADD COLUMN company_id INT AUTO_INCREMENT PRIMARY KEY FIRST,
 ADD COLUMN company_size_min VARCHAR(50) AFTER company_size,
 ADD COLUMN company_size_max VARCHAR(50) AFTER company_size_min;
 
@@ -78,10 +78,19 @@ ADD COLUMN company_size_max VARCHAR(50) AFTER company_size_min;
 -- -----------------------------------------------------
 -- Create specialty dimension and junction table
 -- Stores company specialties in a normalized form
+--
+-- Each dimension declares a unique lookup key on its name column, inline
+-- so that IF NOT EXISTS also skips it on a rerun. The Phase 3 junction
+-- loads join back to the dimension tables by name; without the key every
+-- probe is a full scan of the dimension, with it a single-row lookup.
+-- With unique_checks = 0 the key does not deduplicate the bulk inserts;
+-- the names are made unique by SELECT DISTINCT ... COLLATE utf8mb4_bin.
+-- Foreign-key columns on the child tables are already indexed by InnoDB.
 -- -----------------------------------------------------
 CREATE TABLE IF NOT EXISTS specialty (
     specialty_name_id INT AUTO_INCREMENT PRIMARY KEY,
-    specialty_name VARCHAR(255) NOT NULL
+    specialty_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    UNIQUE KEY uk_specialty_name (specialty_name)
 ) ENGINE=INNODB;
 
 CREATE TABLE IF NOT EXISTS company_specialty (
@@ -89,8 +98,7 @@ CREATE TABLE IF NOT EXISTS company_specialty (
     company_id INT NOT NULL,
     specialty_name_id INT NOT NULL,
     FOREIGN KEY (company_id) REFERENCES company(company_id),
-    FOREIGN KEY (specialty_name_id) REFERENCES specialty(specialty_name_id),
-    UNIQUE (company_id, specialty_name_id)
+    FOREIGN KEY (specialty_name_id) REFERENCES specialty(specialty_name_id)
 ) ENGINE=INNODB;
 
 -- -----------------------------------------------------
@@ -99,7 +107,8 @@ CREATE TABLE IF NOT EXISTS company_specialty (
 -- -----------------------------------------------------
 CREATE TABLE IF NOT EXISTS type (
     company_type_id INT AUTO_INCREMENT PRIMARY KEY,
-    company_type_name VARCHAR(255) NOT NULL
+    company_type_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    UNIQUE KEY uk_type_name (company_type_name)
 ) ENGINE=INNODB;
 
 CREATE TABLE IF NOT EXISTS company_type (
@@ -107,8 +116,7 @@ CREATE TABLE IF NOT EXISTS company_type (
     company_id INT NOT NULL,
     company_type_id INT NOT NULL,
     FOREIGN KEY (company_id) REFERENCES company(company_id),
-    FOREIGN KEY (company_type_id) REFERENCES type(company_type_id),
-    UNIQUE (company_id, company_type_id)
+    FOREIGN KEY (company_type_id) REFERENCES type(company_type_id)
 ) ENGINE=INNODB;
 
 -- -----------------------------------------------------
@@ -117,7 +125,8 @@ CREATE TABLE IF NOT EXISTS company_type (
 -- -----------------------------------------------------
 CREATE TABLE IF NOT EXISTS industry (
     industry_id INT AUTO_INCREMENT PRIMARY KEY,
-    industry_name VARCHAR(255) NOT NULL
+    industry_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    UNIQUE KEY uk_industry_name (industry_name)
 ) ENGINE=INNODB;
 
 CREATE TABLE IF NOT EXISTS industry_type (
@@ -125,8 +134,7 @@ CREATE TABLE IF NOT EXISTS industry_type (
     company_id INT NOT NULL,
     industry_id INT NOT NULL,
     FOREIGN KEY (company_id) REFERENCES company(company_id),
-    FOREIGN KEY (industry_id) REFERENCES industry(industry_id),
-    UNIQUE (company_id, industry_id)
+    FOREIGN KEY (industry_id) REFERENCES industry(industry_id)
 ) ENGINE=INNODB;
 
 -- -----------------------------------------------------
@@ -154,11 +162,11 @@ CREATE TABLE IF NOT EXISTS company_updates (
     company_id INT NOT NULL,
     article_link VARCHAR(500) NOT NULL,
     image VARCHAR(500) NOT NULL, 
-    posted_on DATE NOT NULL,
+    posted_on DATE,
     update_text TEXT NOT NULL,
     total_likes INT NOT NULL,
     FOREIGN KEY (company_id) REFERENCES company(company_id),
-    UNIQUE (update_id, company_id)
+    KEY idx_company (company_id)
 ) ENGINE=INNODB;
 
 CREATE TABLE IF NOT EXISTS affiliated_companies (
@@ -169,46 +177,54 @@ CREATE TABLE IF NOT EXISTS affiliated_companies (
     industry VARCHAR(500) NOT NULL,
     location VARCHAR(500) NOT NULL,
     FOREIGN KEY (company_id) REFERENCES company(company_id),
-    UNIQUE (affiliated_companies_id, company_id)
+    KEY idx_company (company_id)
 ) ENGINE=INNODB;
 
-CREATE TABLE IF NOT EXISTS similar_companies (
-    similar_companies_id INT AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(500) NOT NULL, 
-    linkedin_url VARCHAR(500) NOT NULL,
-    industry VARCHAR(500) NOT NULL,
-    location VARCHAR(500) NOT NULL
-) ENGINE=INNODB;
-
-CREATE TABLE IF NOT EXISTS similar_companies_junction (
-    unique_id INT AUTO_INCREMENT PRIMARY KEY,
-    similar_companies_id INT NOT NULL,
-    company_id INT NOT NULL,
-    FOREIGN KEY (company_id) REFERENCES company(company_id),
-    FOREIGN KEY (similar_companies_id) REFERENCES similar_companies(similar_companies_id),
-    UNIQUE (company_id, similar_companies_id)
-) ENGINE=INNODB;
+-- similar_companies and similar_companies_junction are created in Phase 3
+-- from the deduplicated similar company rows
 
 /*******************************************************************************
  * PHASE 3: DATA TRANSFORMATION AND LOADING
  * Extract data from JSON fields and load into normalized tables
  *******************************************************************************/
 
+-- -----------------------------------------------------
+-- Refresh statistics on company after the Phase 1 rebuild so the loads
+-- below are planned against its real row count and index cardinality
+-- -----------------------------------------------------
+ANALYZE TABLE company;
+
+-- -----------------------------------------------------
+-- Bulk-load settings: company_raw is already consistent, so skip the
+-- per-row foreign key and unique probes and batch the DML under one
+-- transaction. The similar_companies CREATE TABLE ... SELECT, ALTER and
+-- junction CREATE below are DDL and commit implicitly, so the loads before
+-- them are committed there and only the rest is covered by the final COMMIT
+-- -----------------------------------------------------
+SET SESSION foreign_key_checks = 0;
+SET SESSION unique_checks = 0;
+START TRANSACTION;
+
 -- -----------------------------------------------------
 -- Parse company size min/max values from JSON
+-- Populates the existing rows in place
 -- -----------------------------------------------------
-INSERT INTO company (company_size_min, company_size_max)
-SELECT 
-    JSON_EXTRACT(company_size, '$[0]') AS min_value,
-    JSON_EXTRACT(company_size, '$[1]') AS max_value
-FROM company;
+UPDATE company
+SET company_size_min = JSON_UNQUOTE(JSON_EXTRACT(company_size, '$[0]')),
+    company_size_max = JSON_UNQUOTE(JSON_EXTRACT(company_size, '$[1]'))
+WHERE company_size IS NOT NULL;
 
 -- -----------------------------------------------------
 -- Extract and load specialty data
 -- -----------------------------------------------------
--- Step 1: Insert unique specialties into dimension table
-INSERT INTO specialty (specialty_name)
-SELECT DISTINCT TRIM(jt.specialty)
+-- Step 1: Parse the specialities JSON once into a staging table
+CREATE TEMPORARY TABLE tmp_specialty (
+    company_id INT NOT NULL,
+    specialty_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    KEY (company_id),
+    KEY (specialty_name)
+) ENGINE=INNODB
+SELECT cr.company_id, TRIM(jt.specialty) AS specialty_name
 FROM company cr
 JOIN JSON_TABLE(
     cr.specialities,
@@ -218,64 +234,70 @@ JOIN JSON_TABLE(
     )
 ) AS jt
 WHERE cr.specialities IS NOT NULL
-  AND TRIM(jt.specialty) <> ''
-ON DUPLICATE KEY UPDATE specialty_name = specialty_name;
+  AND TRIM(jt.specialty) <> '';
+
+-- Step 2: Insert unique specialties into dimension table
+INSERT IGNORE INTO specialty (specialty_name)
+SELECT DISTINCT specialty_name
+FROM tmp_specialty;
 
--- Step 2: Create relationships between companies and specialties
+-- Step 3: Create relationships between companies and specialties
+-- (plain INSERT: the rows are DISTINCT and the junction key is only added
+-- after the load, so IGNORE could only hide data errors)
 INSERT INTO company_specialty (company_id, specialty_name_id)
-SELECT cr.company_id, s.specialty_name_id
-FROM company cr
-JOIN JSON_TABLE(
-    cr.specialities,
-    '$[*]'
-    COLUMNS (
-       specialty VARCHAR(255) PATH '$'
-    )
-) AS jt
-JOIN specialty s ON s.specialty_name = TRIM(jt.specialty)
-WHERE cr.specialities IS NOT NULL
-  AND TRIM(jt.specialty) <> ''
-ON DUPLICATE KEY UPDATE specialty_name_id = s.specialty_name_id;
+SELECT DISTINCT ts.company_id, s.specialty_name_id
+FROM tmp_specialty ts
+JOIN specialty s ON s.specialty_name = ts.specialty_name;
+
+-- -----------------------------------------------------
+-- Trim company type and industry once so the loads below can compare
+-- the plain columns against the dimension name indexes
+-- -----------------------------------------------------
+UPDATE company
+SET company_type = TRIM(company_type),
+    industry = TRIM(industry)
+WHERE company_type IS NOT NULL
+   OR industry IS NOT NULL;
 
 -- -----------------------------------------------------
 -- Extract and load company type data
 -- -----------------------------------------------------
 -- Step 1: Insert unique company types into dimension table
-INSERT INTO type (company_type_name)
-SELECT DISTINCT TRIM(company_type) AS company_type_name
+-- (deduplicated in utf8mb4_bin, the collation the junction join compares in)
+INSERT IGNORE INTO type (company_type_name)
+SELECT DISTINCT company_type COLLATE utf8mb4_bin AS company_type_name
 FROM company
 WHERE company_type IS NOT NULL
-  AND TRIM(company_type) <> ''
-ON DUPLICATE KEY UPDATE company_type_name = company_type_name;
+  AND company_type <> '';
 
 -- Step 2: Create relationships between companies and types
+-- (plain INSERT: at most one row per company, see company_specialty above)
 INSERT INTO company_type (company_id, company_type_id)
 SELECT cr.company_id, t.company_type_id
 FROM company cr
-JOIN type t ON t.company_type_name = TRIM(cr.company_type)
+JOIN type t ON t.company_type_name = cr.company_type
 WHERE cr.company_type IS NOT NULL
-  AND TRIM(cr.company_type) <> ''
-ON DUPLICATE KEY UPDATE company_type_id = t.company_type_id;
+  AND cr.company_type <> '';
 
 -- -----------------------------------------------------
 -- Extract and load industry data
 -- -----------------------------------------------------
 -- Step 1: Insert unique industries into dimension table
-INSERT INTO industry (industry_name)
-SELECT DISTINCT TRIM(industry) AS industry_name
+-- (deduplicated in utf8mb4_bin, the collation the junction join compares in)
+INSERT IGNORE INTO industry (industry_name)
+SELECT DISTINCT industry COLLATE utf8mb4_bin AS industry_name
 FROM company
 WHERE industry IS NOT NULL
-  AND TRIM(industry) <> ''
-ON DUPLICATE KEY UPDATE industry_name = industry_name;
+  AND industry <> '';
 
 -- Step 2: Create relationships between companies and industries
+-- (plain INSERT: at most one row per company, see company_specialty above)
 INSERT INTO industry_type (company_id, industry_id)
 SELECT cr.company_id, i.industry_id
 FROM company cr
-JOIN industry i ON i.industry_name = TRIM(cr.industry)
+JOIN industry i ON i.industry_name = cr.industry
 WHERE cr.industry IS NOT NULL
-  AND TRIM(cr.industry) <> ''
-ON DUPLICATE KEY UPDATE industry_id = i.industry_id;
+  AND cr.industry <> '';
 
 -- -----------------------------------------------------
 -- Extract and load location data
@@ -316,12 +338,10 @@ SELECT
     cr.company_id,
     COALESCE(jt.article_link, 'No Link Provided') AS article_link,
     COALESCE(jt.image, '') AS image,
-    STR_TO_DATE(
-      CONCAT(
-          COALESCE(jt.year, 1900), '-', 
-          LPAD(COALESCE(jt.month, 1), 2, '0'), '-', 
-          LPAD(COALESCE(jt.day, 1), 2, '0')
-      ), '%Y-%m-%d'
+    DATE_ADD(
+      DATE_ADD(MAKEDATE(COALESCE(jt.year, 1900), 1),
+               INTERVAL (COALESCE(jt.month, 1) - 1) MONTH),
+      INTERVAL (COALESCE(jt.day, 1) - 1) DAY
     ) AS posted_on,
     COALESCE(jt.text, '') AS update_text,
     COALESCE(jt.total_likes, 0) AS total_likes
@@ -367,9 +387,17 @@ WHERE cr.affiliated_companies IS NOT NULL;
 -- -----------------------------------------------------
 -- Extract and load similar companies data
 -- -----------------------------------------------------
--- Step 1: Insert unique similar companies into dimension table
-INSERT INTO similar_companies (name, linkedin_url, industry, location)
-SELECT DISTINCT
+-- Step 1: Parse the similar_companies JSON once into a staging table
+CREATE TEMPORARY TABLE tmp_similar_companies (
+    company_id INT NOT NULL,
+    name VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    linkedin_url VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    industry VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    location VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+    KEY (company_id)
+) ENGINE=INNODB
+SELECT
+    cr.company_id,
     COALESCE(TRIM(jt.name), 'No Name Provided') AS name,
     COALESCE(TRIM(jt.link), 'No Link Provided') AS linkedin_url,
     COALESCE(TRIM(jt.industry), 'No Industry Provided') AS industry,
@@ -388,29 +416,53 @@ JOIN JSON_TABLE(
 WHERE cr.similar_companies IS NOT NULL
   AND TRIM(jt.name) <> '';
 
--- Step 2: Create relationships between companies and similar companies
+-- Step 2: Build the deduplicated dimension table, then add its keys
+-- Indexing the populated table is cheaper than a key insert per row
+CREATE TABLE similar_companies ENGINE=INNODB
+SELECT DISTINCT name, linkedin_url, industry, location
+FROM tmp_similar_companies;
+
+-- Prefix lengths keep the composite key under InnoDB's 3072-byte limit
+ALTER TABLE similar_companies
+ADD COLUMN similar_companies_id INT AUTO_INCREMENT PRIMARY KEY FIRST,
+ADD INDEX idx_sc_lookup (name(191), linkedin_url(191), industry(191), location(191));
+
+CREATE TABLE IF NOT EXISTS similar_companies_junction (
+    unique_id INT AUTO_INCREMENT PRIMARY KEY,
+    similar_companies_id INT NOT NULL,
+    company_id INT NOT NULL,
+    FOREIGN KEY (company_id) REFERENCES company(company_id),
+    FOREIGN KEY (similar_companies_id) REFERENCES similar_companies(similar_companies_id)
+) ENGINE=INNODB;
+
+-- Step 3: Create relationships between companies and similar companies
 INSERT INTO similar_companies_junction (company_id, similar_companies_id)
 SELECT DISTINCT
-    cr.company_id,
+    tsc.company_id,
     sc.similar_companies_id
-FROM company cr
-JOIN JSON_TABLE(
-    cr.similar_companies,
-    '$[*]'
-    COLUMNS (
-       name VARCHAR(500) PATH '$.name',
-       link VARCHAR(500) PATH '$.link',
-       industry VARCHAR(500) PATH '$.industry',
-       location VARCHAR(500) PATH '$.location'
-    )
-) AS jt
+FROM tmp_similar_companies tsc
 JOIN similar_companies sc 
-    ON sc.name         = COALESCE(TRIM(jt.name), 'No Name Provided')
-   AND sc.linkedin_url = COALESCE(TRIM(jt.link), 'No Link Provided')
-   AND sc.industry     = COALESCE(TRIM(jt.industry), 'No Industry Provided')
-   AND sc.location     = COALESCE(TRIM(jt.location), 'No Location Provided')
-WHERE cr.similar_companies IS NOT NULL
-  AND TRIM(jt.name) <> '';
+    ON sc.name         = tsc.name
+   AND sc.linkedin_url = tsc.linkedin_url
+   AND sc.industry     = tsc.industry
+   AND sc.location     = tsc.location;
+
+DROP TEMPORARY TABLE tmp_specialty, tmp_similar_companies;
+
+COMMIT;
+
+-- -----------------------------------------------------
+-- Add the junction unique keys now that the loads are done
+-- The junctions are loaded without them, so each key is built in one
+-- sorted pass instead of being maintained row by row
+-- -----------------------------------------------------
+ALTER TABLE company_specialty ADD UNIQUE KEY uk_company_specialty (company_id, specialty_name_id);
+ALTER TABLE company_type ADD UNIQUE KEY uk_company_type (company_id, company_type_id);
+ALTER TABLE industry_type ADD UNIQUE KEY uk_industry_type (company_id, industry_id);
+ALTER TABLE similar_companies_junction ADD UNIQUE KEY uk_similar_companies_junction (company_id, similar_companies_id);
+
+SET SESSION foreign_key_checks = 1;
+SET SESSION unique_checks = 1;
 
 /*******************************************************************************
  * PHASE 4: CLEANUP
@@ -420,21 +472,22 @@ WHERE cr.similar_companies IS NOT NULL
 -- -----------------------------------------------------
 -- Drop columns that have been normalized into separate tables
 -- -----------------------------------------------------
-ALTER TABLE company DROP COLUMN industry;
-ALTER TABLE company DROP COLUMN hq;
-ALTER TABLE company DROP COLUMN company_type;
-ALTER TABLE company DROP COLUMN specialities;
-ALTER TABLE company DROP COLUMN locations;
-ALTER TABLE company DROP COLUMN similar_companies;
-ALTER TABLE company DROP COLUMN affiliated_companies;
-ALTER TABLE company DROP COLUMN updates;
-ALTER TABLE company DROP COLUMN company_size;
-ALTER TABLE company DROP COLUMN exit_data;
-ALTER TABLE company DROP COLUMN acquisitions;
-ALTER TABLE company DROP COLUMN extra;
-ALTER TABLE company DROP COLUMN funding_data;
-ALTER TABLE company DROP COLUMN categories;
-ALTER TABLE company DROP COLUMN customer_list;
+ALTER TABLE company
+DROP COLUMN industry,
+DROP COLUMN hq,
+DROP COLUMN company_type,
+DROP COLUMN specialities,
+DROP COLUMN locations,
+DROP COLUMN similar_companies,
+DROP COLUMN affiliated_companies,
+DROP COLUMN updates,
+DROP COLUMN company_size,
+DROP COLUMN exit_data,
+DROP COLUMN acquisitions,
+DROP COLUMN extra,
+DROP COLUMN funding_data,
+DROP COLUMN categories,
+DROP COLUMN customer_list;
 
 -- Remove redundant location fields from related companies tables
 ALTER TABLE affiliated_companies DROP COLUMN location;
@@ -3,146 +3,808 @@ Automate SQL queries on the "gp_02" MySQL database.
 
 Instructions:
 1. Ensure you have a .env file with the variable `PASSWORD` set to your MySQL password.
-2. Install any dependencies (e.g. `pip install python-dotenv mysql-connector-python`) if necessary.
+2. Install any dependencies (e.g. `pip install python-dotenv "mysql-connector-python<9.2" orjson`)
+   if necessary. The connector wheels ship its C extension, which the script uses for the bulk
+   loads; 9.2 removed the `multi=True` execute that sends the Phase 2 DDL in one round trip.
 3. Run this Python script. It will connect to localhost with user "root" and database "gp_02",
    then execute the SQL queries in sequence.
 4. Note: The `CREATE TABLE company_raw` is intentionally omitted (already assumed to exist).
 """
 
+import hashlib
+import inspect
+import logging
 import os
-import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import Pool
+
 import mysql.connector
+import orjson
 from dotenv import load_dotenv
+from mysql.connector import ClientFlag, errorcode, pooling
 
+DATABASE = "gp_02"
 
-def log_step(message):
-    """Log migration steps with timestamp"""
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-    print(f"[{timestamp}] {message}")
+# Companies per Phase 3 batch; bounds undo log growth and lets a failed run
+# keep the batches already committed. The one-row-per-company junction loads
+# run as a single transaction instead, since their undo stays small
+BATCH_SIZE = 10000
 
+# Rows per multi-row INSERT when LOAD DATA is unavailable; keeps each
+# statement a few MB, well under the default 64 MB max_allowed_packet
+INSERT_ROWS = 1000
 
-def run_migration():
-    # Load environment variables from .env file
-    load_dotenv()
+# Connections used to run the independent Phase 3 loads in parallel
+PHASE3_WORKERS = 4
 
-    # Read the password from an environment variable named PASSWORD
-    db_password = os.getenv("PASSWORD")
-    if not db_password:
-        raise ValueError("Database password not found in environment variables.")
+# Width of specialty.specialty_name; longer names are cut client-side so the
+# name -> id map keys match the values the server stores
+SPECIALTY_NAME_LENGTH = 255
 
-    log_step("Starting database migration")
 
-    # Connect to MySQL
+def run_batched(connection, sql, max_company_id, label, commit_batches=True):
+    """Run an INSERT ... SELECT over company_id ranges
+
+    The statement is prepared once on the server and re-bound per batch.
+    Each batch is committed unless commit_batches is False, in which case the
+    whole load is left to the caller's single commit.
+    """
+    cursor = connection.cursor(prepared=True)
     try:
-        connection = mysql.connector.connect(
-            host="localhost", user="root", password=db_password, database="gp_02"
-        )
-        cursor = connection.cursor()
-        log_step("Database connection established")
-    except mysql.connector.Error as err:
-        log_step(f"ERROR: Database connection failed: {err}")
-        return
+        for low in range(1, max_company_id + 1, BATCH_SIZE):
+            high = min(low + BATCH_SIZE - 1, max_company_id)
+            cursor.execute(sql, (low, high))
+            if commit_batches:
+                connection.commit()
+            logging.info(f"{label}: loaded companies {low}-{high}")
+    finally:
+        cursor.close()
+
 
+def execute_script(cursor, statements):
+    """Send a list of statements to the server in a single round trip"""
+    for _ in cursor.execute(";".join(statements), multi=True):
+        pass
+
+
+def open_pool(db_password):
+    """Create the gp_02 connection pool shared by the migration and its loaders
+
+    Sessions are not reset when a connection is returned, so the bulk-load
+    settings applied by open_connection survive reuse.
+    """
+    return pooling.MySQLConnectionPool(
+        pool_name="migration",
+        pool_size=PHASE3_WORKERS + 1,
+        pool_reset_session=False,
+        host="localhost",
+        user="root",
+        password=db_password,
+        database=DATABASE,
+        use_pure=False,
+        client_flags=[ClientFlag.MULTI_STATEMENTS],
+        allow_local_infile_in_path=tempfile.gettempdir(),
+    )
+
+
+def open_connection(db_pool):
+    """Take a pooled connection with the bulk-load session settings applied
+
+    company_raw is already consistent, so the per-row FK and unique probes
+    are skipped for the migration.
+    """
+    connection = db_pool.get_connection()
+    cursor = connection.cursor()
+    cursor.execute("SET SESSION foreign_key_checks = 0")
+    cursor.execute("SET SESSION unique_checks = 0")
+    cursor.close()
+    return connection
+
+
+def loader_digest(loader):
+    """Fingerprint a loader by its source and that of the shared helpers
+
+    Editing the loader or any function in LOADER_HELPERS changes the digest,
+    so the load is rerun.
+    """
+    digest = hashlib.sha256()
+    for function in (loader, *LOADER_HELPERS):
+        digest.update(inspect.getsource(function).encode())
+    return digest.hexdigest()
+
+
+def run_loader(loader, db_pool, pool, max_company_id):
+    """Run one Phase 3 loader on its own connection and transaction
+
+    Loaders already recorded in _migration_log with the same digest are
+    skipped. Any other loader has its tables cleared first, so a rerun after
+    a failure starts from scratch instead of duplicating committed batches.
+    """
+    step = loader.__name__
+    digest = loader_digest(loader)
+    connection = open_connection(db_pool)
+    cursor = connection.cursor()
     try:
-        # Phase 1: Initial Schema Setup
-        log_step("PHASE 1: Initial Schema Setup")
+        cursor.execute(
+            "SELECT 1 FROM _migration_log WHERE step = %s AND sha256 = %s", (step, digest)
+        )
+        if cursor.fetchall():
+            logging.info(f"{step}: skipped, already completed")
+            return
+        for table in LOADER_TABLES[loader]:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+
+        loader(connection, pool, max_company_id)
+        cursor.execute(
+            "REPLACE INTO _migration_log (step, sha256, completed_at) VALUES (%s, %s, NOW())",
+            (step, digest),
+        )
+        connection.commit()
+    except Exception:
+        # Parse errors from the process pool surface here as well
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def coalesce(value, default):
+    """Return default when a JSON field is missing or null, like SQL COALESCE"""
+    return default if value is None else value
+
+
+def trim(value):
+    """Strip a JSON scalar the way TRIM() did on the JSON_TABLE column
+
+    TRIM() removes only spaces, so tabs and newlines are kept.
+    """
+    return None if value is None else str(value).strip(" ")
+
+
+def parse_specialties(rows):
+    """Flatten (company_id, specialities JSON) rows into specialty rows"""
+    parsed = []
+    for company_id, payload in rows:
+        for specialty in orjson.loads(payload) or []:
+            name = trim(specialty)
+            if name:
+                parsed.append((company_id, name[:SPECIALTY_NAME_LENGTH].rstrip(" ")))
+    return parsed
+
+
+def parse_locations(rows):
+    """Flatten (company_id, locations JSON) rows into locations rows"""
+    parsed = []
+    for company_id, payload in rows:
+        for location in orjson.loads(payload) or []:
+            country = trim(location.get("country"))
+            if not country:
+                continue
+            parsed.append(
+                (
+                    company_id,
+                    country,
+                    trim(location.get("city")),
+                    trim(location.get("postal_code")),
+                    trim(location.get("line_1")),
+                    location.get("is_hq") in (True, "true", "1"),
+                    trim(location.get("state")),
+                )
+            )
+    return parsed
+
+
+def parse_updates(rows):
+    """Flatten (company_id, updates JSON) rows into company_updates rows"""
+    parsed = []
+    for company_id, payload in rows:
+        for update in orjson.loads(payload) or []:
+            posted = update.get("posted_on") or {}
+            # Same roll-over semantics as MAKEDATE + INTERVAL in the SQL script;
+            # a part that is not a number or a date out of range is stored as NULL
+            try:
+                year = int(coalesce(posted.get("year"), 1900))
+                month = int(coalesce(posted.get("month"), 1))
+                day = int(coalesce(posted.get("day"), 1))
+                posted_on = date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+                posted_on += timedelta(days=day - 1)
+            except (TypeError, ValueError, OverflowError):
+                posted_on = None
+            parsed.append(
+                (
+                    company_id,
+                    coalesce(update.get("article_link"), "No Link Provided"),
+                    coalesce(update.get("image"), ""),
+                    posted_on,
+                    coalesce(update.get("text"), ""),
+                    coalesce(update.get("total_likes"), 0),
+                )
+            )
+    return parsed
+
+
+def parse_affiliated_companies(rows):
+    """Flatten (company_id, affiliated_companies JSON) rows into affiliate rows"""
+    parsed = []
+    for company_id, payload in rows:
+        for company in orjson.loads(payload) or []:
+            parsed.append(
+                (
+                    company_id,
+                    coalesce(company.get("name"), "No Name Provided"),
+                    coalesce(company.get("link"), "No Link Provided"),
+                    coalesce(company.get("industry"), "No Industry Provided"),
+                    coalesce(company.get("location"), "No Location Provided"),
+                )
+            )
+    return parsed
+
+
+def parse_similar_companies(rows):
+    """Flatten (company_id, similar_companies JSON) rows into similar company rows"""
+    parsed = []
+    for company_id, payload in rows:
+        for company in orjson.loads(payload) or []:
+            name = trim(company.get("name"))
+            if not name:
+                continue
+            parsed.append(
+                (
+                    company_id,
+                    name,
+                    coalesce(trim(company.get("link")), "No Link Provided"),
+                    coalesce(trim(company.get("industry")), "No Industry Provided"),
+                    coalesce(trim(company.get("location")), "No Location Provided"),
+                )
+            )
+    return parsed
+
+
+# Column list shared by the affiliated and similar company rows, so the
+# statements built from it stay textually identical
+COMPANY_REFERENCE_COLUMNS = ("name", "linkedin_url", "industry", "location")
 
-        # Rename staging table to final table name
-        log_step("Renaming raw table to company")
-        cursor.execute("ALTER TABLE company_raw RENAME TO company")
 
-        # Add primary key and columns for company size
-        log_step("Adding primary key and company size columns")
+def tsv_field(value):
+    """Format a value for LOAD DATA's default tab-separated, backslash-escaped input"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def load_infile(cursor, table, columns, rows):
+    """Bulk-load rows into table through a temporary file and LOAD DATA LOCAL INFILE"""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="\n", suffix=".tsv") as tsv:
+        for row in rows:
+            tsv.write("\t".join(tsv_field(value) for value in row) + "\n")
+        tsv.flush()
         cursor.execute(
-            "ALTER TABLE company ADD COLUMN company_id INT AUTO_INCREMENT PRIMARY KEY FIRST"
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            f"CHARACTER SET utf8mb4 ({', '.join(columns)})",
+            (tsv.name,),
         )
+
+
+def local_infile_enabled(cursor):
+    """Return whether the server accepts LOAD DATA LOCAL INFILE"""
+    cursor.execute("SELECT @@GLOBAL.local_infile")
+    (local_infile,) = cursor.fetchone()
+    return bool(local_infile)
+
+
+def bulk_insert(cursor, table, columns, rows, local_infile):
+    """Insert parsed rows, through LOAD DATA LOCAL INFILE when the server allows it
+
+    Otherwise the rows go through executemany in slices of INSERT_ROWS, which
+    the connector rewrites into multi-row INSERTs.
+    """
+    if local_infile:
+        load_infile(cursor, table, columns, rows)
+        return
+    placeholders = ", ".join(["%s"] * len(columns))
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    for start in range(0, len(rows), INSERT_ROWS):
+        cursor.executemany(sql, rows[start : start + INSERT_ROWS])
+
+
+def add_junction_key(cursor, table, dimension_id):
+    """Add the (company_id, dimension_id) unique key once a junction is loaded
+
+    Junction tables are created without it so the bulk load appends rows
+    instead of maintaining a unique B-tree per row; the key is then built
+    in one sorted pass. The loads never produce duplicate pairs. A key left
+    by an earlier run of the loader is kept as is.
+    """
+    try:
         cursor.execute(
-            """
-            ALTER TABLE company
-            ADD COLUMN company_size_min VARCHAR(50) AFTER company_size,
-            ADD COLUMN company_size_max VARCHAR(50) AFTER company_size_min
+            f"ALTER TABLE {table} ADD UNIQUE KEY uk_{table} (company_id, {dimension_id})"
+        )
+    except mysql.connector.Error as err:
+        if err.errno != errorcode.ER_DUP_KEYNAME:
+            raise
+
+
+def extract_json_rows(connection, pool, column, parser, max_company_id):
+    """Yield parsed rows for one JSON column of company, a batch at a time
+
+    Batches of BATCH_SIZE companies are fetched on the loader's connection
+    and parsed in the process pool while the next batch is being fetched.
+    The range SELECT is prepared once and re-bound per batch; the cursor is
+    unbuffered and each range is drained before the loader writes, so client
+    memory stays O(BATCH_SIZE) rather than O(company).
+    """
+    cursor = connection.cursor(prepared=True)
+    sql = (
+        f"SELECT company_id, {column} FROM company "
+        f"WHERE company_id BETWEEN %s AND %s AND {column} IS NOT NULL"
+    )
+    pending = None
+    for low in range(1, max_company_id + 1, BATCH_SIZE):
+        high = min(low + BATCH_SIZE - 1, max_company_id)
+        cursor.execute(sql, (low, high))
+        batch = cursor.fetchall()
+        if pending is not None:
+            yield pending.get()
+        pending = pool.apply_async(parser, (batch,))
+        logging.info(f"{column}: parsing companies {low}-{high}")
+    if pending is not None:
+        yield pending.get()
+    cursor.close()
+
+
+def load_specialties(connection, pool, max_company_id):
+    """Load the specialty dimension and company_specialty junction
+
+    Names are deduplicated in-process: each batch inserts only the names not
+    seen before and reads their ids back into a name -> id map, which is
+    then used to build the junction rows client-side.
+    """
+    cursor = connection.cursor()
+    logging.info("Extracting and loading specialty data")
+    local_infile = local_infile_enabled(cursor)
+    specialty_ids = {}
+    for rows in extract_json_rows(
+        connection, pool, "specialities", parse_specialties, max_company_id
+    ):
+        new_names = {name for _, name in rows} - specialty_ids.keys()
+        if new_names:
+            cursor.executemany(
+                "INSERT IGNORE INTO specialty (specialty_name) VALUES (%s)",
+                [(name,) for name in new_names],
+            )
+            # Read the ids back in bounded IN lists
+            new_names = list(new_names)
+            for start in range(0, len(new_names), INSERT_ROWS):
+                chunk = new_names[start : start + INSERT_ROWS]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"SELECT specialty_name, specialty_name_id FROM specialty "
+                    f"WHERE specialty_name IN ({placeholders})",
+                    tuple(chunk),
+                )
+                specialty_ids.update(cursor.fetchall())
+
+        # A name the server rejected has no id; skip it rather than fail the load
+        missing = {name for _, name in rows} - specialty_ids.keys()
+        if missing:
+            logging.warning(
+                f"Skipping {len(missing)} specialty names with no id: {sorted(missing)[:5]}"
+            )
+        bulk_insert(
+            cursor,
+            "company_specialty",
+            ("company_id", "specialty_name_id"),
+            list(
+                {
+                    (company_id, specialty_ids[name])
+                    for company_id, name in rows
+                    if name not in missing
+                }
+            ),
+            local_infile,
+        )
+        connection.commit()
+
+    add_junction_key(cursor, "company_specialty", "specialty_name_id")
+    cursor.close()
+
+
+def load_company_types(connection, pool, max_company_id):
+    """Load the type dimension and company_type junction"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading company type data")
+    # Deduplicate in the dimension's binary collation, which is also what the
+    # junction join compares in, so no spelling is folded into another
+    cursor.execute(
+        """
+        INSERT IGNORE INTO type (company_type_name)
+        SELECT DISTINCT company_type COLLATE utf8mb4_bin AS company_type_name
+        FROM company
+        WHERE company_type IS NOT NULL
+          AND company_type <> ''
+    """
+    )
+
+    # Plain INSERT: the join yields at most one row per company, and the
+    # junction key only exists after the load, so IGNORE could only hide errors
+    run_batched(
+        connection,
         """
+        INSERT INTO company_type (company_id, company_type_id)
+        SELECT cr.company_id, t.company_type_id
+        FROM company cr
+        JOIN type t ON t.company_type_name = cr.company_type
+        WHERE cr.company_type IS NOT NULL
+          AND cr.company_type <> ''
+          AND cr.company_id BETWEEN %s AND %s
+    """,
+        max_company_id,
+        "company_type",
+        commit_batches=False,
+    )
+    add_junction_key(cursor, "company_type", "company_type_id")
+    cursor.close()
+
+
+def load_industries(connection, pool, max_company_id):
+    """Load the industry dimension and industry_type junction"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading industry data")
+    # Deduplicate in the dimension's binary collation, which is also what the
+    # junction join compares in, so no spelling is folded into another
+    cursor.execute(
+        """
+        INSERT IGNORE INTO industry (industry_name)
+        SELECT DISTINCT industry COLLATE utf8mb4_bin AS industry_name
+        FROM company
+        WHERE industry IS NOT NULL
+          AND industry <> ''
+    """
+    )
+
+    # Plain INSERT: the join yields at most one row per company, and the
+    # junction key only exists after the load, so IGNORE could only hide errors
+    run_batched(
+        connection,
+        """
+        INSERT INTO industry_type (company_id, industry_id)
+        SELECT cr.company_id, i.industry_id
+        FROM company cr
+        JOIN industry i ON i.industry_name = cr.industry
+        WHERE cr.industry IS NOT NULL
+          AND cr.industry <> ''
+          AND cr.company_id BETWEEN %s AND %s
+    """,
+        max_company_id,
+        "industry_type",
+        commit_batches=False,
+    )
+    add_junction_key(cursor, "industry_type", "industry_id")
+    cursor.close()
+
+
+def load_locations(connection, pool, max_company_id):
+    """Load company locations"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading location data")
+    local_infile = local_infile_enabled(cursor)
+    columns = ("company_id", "country", "city", "postal_code", "address_line1", "is_hq", "state")
+    for rows in extract_json_rows(
+        connection, pool, "locations", parse_locations, max_company_id
+    ):
+        bulk_insert(cursor, "locations", columns, rows, local_infile)
+        connection.commit()
+    cursor.close()
+
+
+def load_company_updates(connection, pool, max_company_id):
+    """Load company updates"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading company update data")
+    local_infile = local_infile_enabled(cursor)
+    columns = ("company_id", "article_link", "image", "posted_on", "update_text", "total_likes")
+    for rows in extract_json_rows(
+        connection, pool, "updates", parse_updates, max_company_id
+    ):
+        bulk_insert(cursor, "company_updates", columns, rows, local_infile)
+        connection.commit()
+    cursor.close()
+
+
+def load_affiliated_companies(connection, pool, max_company_id):
+    """Load affiliated companies"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading affiliated companies data")
+    local_infile = local_infile_enabled(cursor)
+    for rows in extract_json_rows(
+        connection,
+        pool,
+        "affiliated_companies",
+        parse_affiliated_companies,
+        max_company_id,
+    ):
+        bulk_insert(
+            cursor,
+            "affiliated_companies",
+            ("company_id", *COMPANY_REFERENCE_COLUMNS),
+            rows,
+            local_infile,
         )
         connection.commit()
+    cursor.close()
 
-        # Phase 2: Create Dimension and Junction Tables
-        log_step("PHASE 2: Creating dimension and junction tables")
 
-        # Specialty tables
-        log_step("Creating specialty tables")
-        cursor.execute(
+def load_similar_companies(connection, pool, max_company_id):
+    """Load the similar_companies dimension and junction"""
+    cursor = connection.cursor()
+    logging.info("Extracting and loading similar companies data")
+    local_infile = local_infile_enabled(cursor)
+
+    # Start from scratch if an earlier run stopped partway through
+    cursor.execute("DROP TABLE IF EXISTS similar_companies_junction, similar_companies")
+
+    # Parse the similar_companies JSON once; both loads below read the result
+    cursor.execute(
+        """
+        CREATE TEMPORARY TABLE tmp_similar_companies (
+            company_id INT NOT NULL,
+            name VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+            linkedin_url VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+            industry VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+            location VARCHAR(500) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+            KEY (company_id)
+        ) ENGINE=INNODB
+    """
+    )
+    for rows in extract_json_rows(
+        connection,
+        pool,
+        "similar_companies",
+        parse_similar_companies,
+        max_company_id,
+    ):
+        bulk_insert(
+            cursor,
+            "tmp_similar_companies",
+            ("company_id", *COMPANY_REFERENCE_COLUMNS),
+            rows,
+            local_infile,
+        )
+
+    # Build the deduplicated dimension first and index it afterwards, rather
+    # than paying a primary key insert per row into an empty table
+    cursor.execute(
+        f"""
+        CREATE TABLE similar_companies ENGINE=INNODB
+        SELECT DISTINCT {", ".join(COMPANY_REFERENCE_COLUMNS)}
+        FROM tmp_similar_companies
+    """
+    )
+
+    # Prefix lengths keep the composite key under InnoDB's 3072-byte limit
+    cursor.execute(
+        """
+        ALTER TABLE similar_companies
+        ADD COLUMN similar_companies_id INT AUTO_INCREMENT PRIMARY KEY FIRST,
+        ADD INDEX idx_sc_lookup (name(191), linkedin_url(191), industry(191), location(191))
+    """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS similar_companies_junction (
+            unique_id INT AUTO_INCREMENT PRIMARY KEY,
+            similar_companies_id INT NOT NULL,
+            company_id INT NOT NULL,
+            FOREIGN KEY (company_id) REFERENCES company(company_id),
+            FOREIGN KEY (similar_companies_id) REFERENCES similar_companies(similar_companies_id)
+        ) ENGINE=INNODB
+    """
+    )
+
+    run_batched(
+        connection,
+        """
+        INSERT INTO similar_companies_junction (company_id, similar_companies_id)
+        SELECT DISTINCT
+            tsc.company_id,
+            sc.similar_companies_id
+        FROM tmp_similar_companies tsc
+        JOIN similar_companies sc 
+            ON sc.name         = tsc.name
+           AND sc.linkedin_url = tsc.linkedin_url
+           AND sc.industry     = tsc.industry
+           AND sc.location     = tsc.location
+        WHERE tsc.company_id BETWEEN %s AND %s
+    """,
+        max_company_id,
+        "similar_companies_junction",
+    )
+    add_junction_key(cursor, "similar_companies_junction", "similar_companies_id")
+
+    cursor.execute("DROP TEMPORARY TABLE tmp_similar_companies")
+    cursor.close()
+
+
+# Independent Phase 3 loads; each writes only its own tables, so they can
+# run concurrently on separate connections
+PHASE3_LOADERS = (
+    load_specialties,
+    load_company_types,
+    load_industries,
+    load_locations,
+    load_company_updates,
+    load_affiliated_companies,
+    load_similar_companies,
+)
+
+# Tables each loader fills, cleared before it is (re)run; similar_companies
+# and its junction are dropped and recreated by load_similar_companies
+LOADER_TABLES = {
+    load_specialties: ("company_specialty", "specialty"),
+    load_company_types: ("company_type", "type"),
+    load_industries: ("industry_type", "industry"),
+    load_locations: ("locations",),
+    load_company_updates: ("company_updates",),
+    load_affiliated_companies: ("affiliated_companies",),
+    load_similar_companies: (),
+}
+
+# Parsing and loading helpers the loaders build on; part of every loader's
+# digest, since a change to any of them can change what a loader writes
+LOADER_HELPERS = (
+    run_batched,
+    coalesce,
+    trim,
+    parse_specialties,
+    parse_locations,
+    parse_updates,
+    parse_affiliated_companies,
+    parse_similar_companies,
+    tsv_field,
+    load_infile,
+    bulk_insert,
+    add_junction_key,
+    extract_json_rows,
+)
+
+
+# Tables created by Phase 2
+PHASE2_TABLES = (
+    "specialty",
+    "company_specialty",
+    "type",
+    "company_type",
+    "industry",
+    "industry_type",
+    "locations",
+    "company_updates",
+    "affiliated_companies",
+)
+
+
+def existing_schema(cursor):
+    """Map each migration table present in the database to its column names
+
+    One information_schema lookup, restricted to this schema so it stays a
+    cheap dictionary read instead of scanning every database on the server.
+    """
+    tables = ("company_raw", "company", "similar_companies") + PHASE2_TABLES
+    placeholders = ", ".join(["%s"] * len(tables))
+    cursor.execute(
+        f"""
+        SELECT TABLE_NAME, COLUMN_NAME
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+          AND TABLE_NAME IN ({placeholders})
+    """,
+        (DATABASE, *tables),
+    )
+    schema = {}
+    for table_name, column_name in cursor.fetchall():
+        schema.setdefault(table_name, set()).add(column_name)
+    return schema
+
+
+def migrate_company(connection, cursor, rename=True):
+    """Phase 1: rename the raw table and add the key and size columns
+
+    rename is False when an earlier run already renamed company_raw but
+    stopped before the columns were added.
+    """
+    logging.info("PHASE 1: Initial Schema Setup")
+
+    # Rename the staging table, then add the primary key and company size
+    # columns in a single rebuild
+    logging.info("Renaming raw table to company and adding key columns")
+    statements = ["ALTER TABLE company_raw RENAME TO company"] if rename else []
+    statements.append(
+        """
+        ALTER TABLE company
+        ADD COLUMN company_id INT AUTO_INCREMENT PRIMARY KEY FIRST,
+        ADD COLUMN company_size_min VARCHAR(50) AFTER company_size,
+        ADD COLUMN company_size_max VARCHAR(50) AFTER company_size_min
+    """
+    )
+    execute_script(cursor, statements)
+    connection.commit()
+
+
+def create_tables(connection, cursor):
+    """Phase 2: create the dimension and junction tables"""
+    logging.info("PHASE 2: Creating dimension and junction tables")
+
+    # similar_companies and its junction are built by load_similar_companies
+    # once the distinct rows are known.
+    #
+    # The uk_*_name keys are the unique lookup indexes for the Phase 3 junction
+    # joins, declared inline so a rerun's IF NOT EXISTS skips them too; FK
+    # columns on the child tables are already indexed by InnoDB. The loads run
+    # with unique_checks = 0, so names are deduplicated by SELECT DISTINCT in
+    # utf8mb4_bin and the specialty name -> id map instead
+    execute_script(
+        cursor,
+        [
+            # Specialty tables
             """
             CREATE TABLE IF NOT EXISTS specialty (
                 specialty_name_id INT AUTO_INCREMENT PRIMARY KEY,
-                specialty_name VARCHAR(255) NOT NULL
+                specialty_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+                UNIQUE KEY uk_specialty_name (specialty_name)
             ) ENGINE=INNODB
-        """
-        )
-
-        cursor.execute(
+        """,
             """
             CREATE TABLE IF NOT EXISTS company_specialty (
                 unique_id INT AUTO_INCREMENT PRIMARY KEY,
                 company_id INT NOT NULL,
                 specialty_name_id INT NOT NULL,
                 FOREIGN KEY (company_id) REFERENCES company(company_id),
-                FOREIGN KEY (specialty_name_id) REFERENCES specialty(specialty_name_id),
-                UNIQUE (company_id, specialty_name_id)
+                FOREIGN KEY (specialty_name_id) REFERENCES specialty(specialty_name_id)
             ) ENGINE=INNODB
-        """
-        )
+        """,
 
-        # Type tables
-        log_step("Creating company type tables")
-        cursor.execute(
+            # Type tables
             """
             CREATE TABLE IF NOT EXISTS type (
                 company_type_id INT AUTO_INCREMENT PRIMARY KEY,
-                company_type_name VARCHAR(255) NOT NULL
+                company_type_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+                UNIQUE KEY uk_type_name (company_type_name)
             ) ENGINE=INNODB
-        """
-        )
-
-        cursor.execute(
+        """,
             """
             CREATE TABLE IF NOT EXISTS company_type (
                 unique_id INT AUTO_INCREMENT PRIMARY KEY,
                 company_id INT NOT NULL,
                 company_type_id INT NOT NULL,
                 FOREIGN KEY (company_id) REFERENCES company(company_id),
-                FOREIGN KEY (company_type_id) REFERENCES type(company_type_id),
-                UNIQUE (company_id, company_type_id)
+                FOREIGN KEY (company_type_id) REFERENCES type(company_type_id)
             ) ENGINE=INNODB
-        """
-        )
+        """,
 
-        # Industry tables
-        log_step("Creating industry tables")
-        cursor.execute(
+            # Industry tables
             """
             CREATE TABLE IF NOT EXISTS industry (
                 industry_id INT AUTO_INCREMENT PRIMARY KEY,
-                industry_name VARCHAR(255) NOT NULL
+                industry_name VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+                UNIQUE KEY uk_industry_name (industry_name)
             ) ENGINE=INNODB
-        """
-        )
-
-        cursor.execute(
+        """,
             """
             CREATE TABLE IF NOT EXISTS industry_type (
                 unique_id INT AUTO_INCREMENT PRIMARY KEY,
                 company_id INT NOT NULL,
                 industry_id INT NOT NULL,
                 FOREIGN KEY (company_id) REFERENCES company(company_id),
-                FOREIGN KEY (industry_id) REFERENCES industry(industry_id),
-                UNIQUE (company_id, industry_id)
+                FOREIGN KEY (industry_id) REFERENCES industry(industry_id)
             ) ENGINE=INNODB
-        """
-        )
+        """,
 
-        # Locations table
-        log_step("Creating locations table")
-        cursor.execute(
+            # Locations table
             """
             CREATE TABLE IF NOT EXISTS locations (
                 locations_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -155,28 +817,22 @@ def run_migration():
                 state VARCHAR(255),
                 FOREIGN KEY (company_id) REFERENCES company(company_id)
             ) ENGINE=INNODB
-        """
-        )
+        """,
 
-        # Company updates and relationships tables
-        log_step("Creating tables for updates and relationships")
-        cursor.execute(
+            # Company updates and relationships tables
             """
             CREATE TABLE IF NOT EXISTS company_updates (
                 update_id INT AUTO_INCREMENT PRIMARY KEY,
                 company_id INT NOT NULL,
                 article_link VARCHAR(500) NOT NULL,
                 image VARCHAR(500) NOT NULL, 
-                posted_on DATE NOT NULL,
+                posted_on DATE,
                 update_text TEXT NOT NULL,
                 total_likes INT NOT NULL,
                 FOREIGN KEY (company_id) REFERENCES company(company_id),
-                UNIQUE (update_id, company_id)
+                KEY idx_company (company_id)
             ) ENGINE=INNODB
-        """
-        )
-
-        cursor.execute(
+        """,
             """
             CREATE TABLE IF NOT EXISTS affiliated_companies (
                 affiliated_companies_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -186,336 +842,255 @@ def run_migration():
                 industry VARCHAR(500) NOT NULL,
                 location VARCHAR(500) NOT NULL,
                 FOREIGN KEY (company_id) REFERENCES company(company_id),
-                UNIQUE (affiliated_companies_id, company_id)
+                KEY idx_company (company_id)
             ) ENGINE=INNODB
-        """
-        )
+        """,
+        ],
+    )
+    connection.commit()
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS similar_companies (
-                similar_companies_id INT AUTO_INCREMENT PRIMARY KEY,
-                name VARCHAR(500) NOT NULL, 
-                linkedin_url VARCHAR(500) NOT NULL,
-                industry VARCHAR(500) NOT NULL,
-                location VARCHAR(500) NOT NULL
-            ) ENGINE=INNODB
-        """
-        )
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS similar_companies_junction (
-                unique_id INT AUTO_INCREMENT PRIMARY KEY,
-                similar_companies_id INT NOT NULL,
-                company_id INT NOT NULL,
-                FOREIGN KEY (company_id) REFERENCES company(company_id),
-                FOREIGN KEY (similar_companies_id) REFERENCES similar_companies(similar_companies_id),
-                UNIQUE (company_id, similar_companies_id)
-            ) ENGINE=INNODB
+def load_data(connection, cursor, db_pool):
+    """Phase 3: normalize the company columns and run the loaders"""
+    logging.info("PHASE 3: Data transformation and loading")
+
+    # Completed loaders are recorded here so a rerun can skip them
+    cursor.execute(
         """
-        )
-        connection.commit()
+        CREATE TABLE IF NOT EXISTS _migration_log (
+            step VARCHAR(64) PRIMARY KEY,
+            sha256 CHAR(64) NOT NULL,
+            completed_at DATETIME NOT NULL
+        ) ENGINE=INNODB
+    """
+    )
 
-        # Phase 3: Data Transformation and Loading
-        log_step("PHASE 3: Data transformation and loading")
+    # Refresh statistics after the Phase 1 rebuild so the loads are planned
+    # against the real row count; ANALYZE commits implicitly, so run it first
+    cursor.execute("ANALYZE TABLE company")
+    cursor.fetchall()
+    connection.start_transaction()
 
-        # Parse company size min/max
-        log_step("Parsing company size min/max values")
-        cursor.execute(
-            """
-            INSERT INTO company (company_size_min, company_size_max)
-            SELECT 
-                JSON_EXTRACT(company_size, '$[0]') AS min_value,
-                JSON_EXTRACT(company_size, '$[1]') AS max_value
-            FROM company
-        """
-        )
+    cursor.execute("SELECT COALESCE(MAX(company_id), 0) FROM company")
+    (max_company_id,) = cursor.fetchone()
 
-        # Extract specialty data
-        log_step("Extracting and loading specialty data")
-        cursor.execute(
-            """
-            INSERT INTO specialty (specialty_name)
-            SELECT DISTINCT TRIM(jt.specialty)
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.specialities,
-                '$[*]'
-                COLUMNS (
-                   specialty VARCHAR(255) PATH '$'
-                )
-            ) AS jt
-            WHERE cr.specialities IS NOT NULL
-              AND TRIM(jt.specialty) <> ''
-            ON DUPLICATE KEY UPDATE specialty_name = specialty_name
+    # Parse company size min/max
+    logging.info("Parsing company size min/max values")
+    cursor.execute(
         """
-        )
+        UPDATE company
+        SET company_size_min = JSON_UNQUOTE(JSON_EXTRACT(company_size, '$[0]')),
+            company_size_max = JSON_UNQUOTE(JSON_EXTRACT(company_size, '$[1]'))
+        WHERE company_size IS NOT NULL
+    """
+    )
 
-        cursor.execute(
-            """
-            INSERT INTO company_specialty (company_id, specialty_name_id)
-            SELECT cr.company_id, s.specialty_name_id
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.specialities,
-                '$[*]'
-                COLUMNS (
-                   specialty VARCHAR(255) PATH '$'
-                )
-            ) AS jt
-            JOIN specialty s ON s.specialty_name = TRIM(jt.specialty)
-            WHERE cr.specialities IS NOT NULL
-              AND TRIM(jt.specialty) <> ''
-            ON DUPLICATE KEY UPDATE specialty_name_id = s.specialty_name_id
+    # Trim company type and industry once so the loads below can compare
+    # the plain columns against the dimension name indexes
+    logging.info("Normalizing company type and industry values")
+    cursor.execute(
         """
-        )
+        UPDATE company
+        SET company_type = TRIM(company_type),
+            industry = TRIM(industry)
+        WHERE company_type IS NOT NULL
+           OR industry IS NOT NULL
+    """
+    )
 
-        # Extract company type data
-        log_step("Extracting and loading company type data")
-        cursor.execute(
-            """
-            INSERT INTO type (company_type_name)
-            SELECT DISTINCT TRIM(company_type) AS company_type_name
-            FROM company
-            WHERE company_type IS NOT NULL
-              AND TRIM(company_type) <> ''
-            ON DUPLICATE KEY UPDATE company_type_name = company_type_name
-        """
-        )
+    connection.commit()
 
-        cursor.execute(
-            """
-            INSERT INTO company_type (company_id, company_type_id)
-            SELECT cr.company_id, t.company_type_id
-            FROM company cr
-            JOIN type t ON t.company_type_name = TRIM(cr.company_type)
-            WHERE cr.company_type IS NOT NULL
-              AND TRIM(cr.company_type) <> ''
-            ON DUPLICATE KEY UPDATE company_type_id = t.company_type_id
-        """
-        )
+    # The loads write disjoint tables, so run them on parallel connections
+    logging.info(f"Running {len(PHASE3_LOADERS)} loads on {PHASE3_WORKERS} connections")
+    # JSON payloads are parsed client-side in a process pool shared by
+    # the loaders
+    with Pool() as pool, ThreadPoolExecutor(PHASE3_WORKERS) as executor:
+        futures = [
+            executor.submit(run_loader, loader, db_pool, pool, max_company_id)
+            for loader in PHASE3_LOADERS
+        ]
+        for future in futures:
+            future.result()
 
-        # Extract industry data
-        log_step("Extracting and loading industry data")
-        cursor.execute(
-            """
-            INSERT INTO industry (industry_name)
-            SELECT DISTINCT TRIM(industry) AS industry_name
-            FROM company
-            WHERE industry IS NOT NULL
-              AND TRIM(industry) <> ''
-            ON DUPLICATE KEY UPDATE industry_name = industry_name
-        """
-        )
 
-        cursor.execute(
-            """
-            INSERT INTO industry_type (company_id, industry_id)
-            SELECT cr.company_id, i.industry_id
-            FROM company cr
-            JOIN industry i ON i.industry_name = TRIM(cr.industry)
-            WHERE cr.industry IS NOT NULL
-              AND TRIM(cr.industry) <> ''
-            ON DUPLICATE KEY UPDATE industry_id = i.industry_id
-        """
-        )
+# JSON and free-text source columns that are normalized out of company
+REDUNDANT_COMPANY_COLUMNS = (
+    "industry",
+    "hq",
+    "company_type",
+    "specialities",
+    "locations",
+    "similar_companies",
+    "affiliated_companies",
+    "updates",
+    "company_size",
+    "exit_data",
+    "acquisitions",
+    "extra",
+    "funding_data",
+    "categories",
+    "customer_list",
+)
 
-        # Extract location data
-        log_step("Extracting and loading location data")
-        cursor.execute(
-            """
-            INSERT INTO locations (company_id, country, city, postal_code, address_line1, is_hq, state)
-            SELECT 
-                cr.company_id,
-                TRIM(jt.country) AS country,
-                TRIM(jt.city) AS city,
-                TRIM(jt.postal_code) AS postal_code,
-                TRIM(jt.line_1) AS address_line1,
-                CASE 
-                    WHEN TRIM(jt.is_hq) IN ('true', '1') THEN TRUE 
-                    ELSE FALSE 
-                END AS is_hq,
-                TRIM(jt.state) AS state
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.locations,
-                '$[*]' 
-                COLUMNS (
-                   country     VARCHAR(255) PATH '$.country',
-                   city        VARCHAR(255) PATH '$.city',
-                   postal_code VARCHAR(50)  PATH '$.postal_code',
-                   line_1      VARCHAR(500) PATH '$.line_1',
-                   is_hq       VARCHAR(10)  PATH '$.is_hq',
-                   state       VARCHAR(255) PATH '$.state'
-                )
-            ) AS jt
-            WHERE cr.locations IS NOT NULL
-              AND TRIM(jt.country) <> ''
-        """
-        )
 
-        # Extract company update data
-        log_step("Extracting and loading company update data")
-        cursor.execute(
-            """
-            INSERT INTO company_updates (company_id, article_link, image, posted_on, update_text, total_likes)
-            SELECT 
-                cr.company_id,
-                COALESCE(jt.article_link, 'No Link Provided') AS article_link,
-                COALESCE(jt.image, '') AS image,
-                STR_TO_DATE(
-                  CONCAT(
-                      COALESCE(jt.year, 1900), '-', 
-                      LPAD(COALESCE(jt.month, 1), 2, '0'), '-', 
-                      LPAD(COALESCE(jt.day, 1), 2, '0')
-                  ), '%Y-%m-%d'
-                ) AS posted_on,
-                COALESCE(jt.text, '') AS update_text,
-                COALESCE(jt.total_likes, 0) AS total_likes
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.updates,
-                '$[*]'
-                COLUMNS (
-                  article_link VARCHAR(500) PATH '$.article_link',
-                  image        VARCHAR(500) PATH '$.image',
-                  day          INT PATH '$.posted_on.day',
-                  month        INT PATH '$.posted_on.month',
-                  year         INT PATH '$.posted_on.year',
-                  text         TEXT PATH '$.text',
-                  total_likes  INT PATH '$.total_likes'
-                )
-            ) AS jt
-            WHERE cr.updates IS NOT NULL
-        """
-        )
+def drop_columns(cursor, table, columns):
+    """Drop columns as a metadata-only change, rebuilding only if refused
 
-        # Extract affiliated companies data
-        log_step("Extracting and loading affiliated companies data")
-        cursor.execute(
-            """
-            INSERT INTO affiliated_companies (company_id, name, linkedin_url, industry, location)
-            SELECT 
-                cr.company_id,
-                COALESCE(jt.name, 'No Name Provided') AS name,
-                COALESCE(jt.link, 'No Link Provided') AS linkedin_url,
-                COALESCE(jt.industry, 'No Industry Provided') AS industry,
-                COALESCE(jt.location, 'No Location Provided') AS location
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.affiliated_companies,
-                '$[*]'
-                COLUMNS (
-                    name VARCHAR(500) PATH '$.name',
-                    link VARCHAR(500) PATH '$.link',
-                    industry VARCHAR(500) PATH '$.industry',
-                    location VARCHAR(500) PATH '$.location'
-                )
-            ) AS jt
-            WHERE cr.affiliated_companies IS NOT NULL
-        """
-        )
+    Instant drops need MySQL 8.0.29+ and a table below its row-version limit;
+    otherwise the table is rebuilt in place without blocking reads or writes.
+    """
+    drops = ", ".join(f"DROP COLUMN {column}" for column in columns)
+    try:
+        cursor.execute(f"ALTER TABLE {table} {drops}, ALGORITHM=INSTANT")
+    except mysql.connector.Error as err:
+        if err.errno not in (
+            errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED,
+            errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON,
+            errorcode.ER_INNODB_MAX_ROW_VERSION,
+        ):
+            raise
+        logging.info(f"{table}: instant drop refused ({err.msg}), rebuilding in place")
+        cursor.execute(f"ALTER TABLE {table} {drops}, ALGORITHM=INPLACE, LOCK=NONE")
 
-        # Extract similar companies data
-        log_step("Extracting and loading similar companies data")
-        cursor.execute(
-            """
-            INSERT INTO similar_companies (name, linkedin_url, industry, location)
-            SELECT DISTINCT
-                COALESCE(TRIM(jt.name), 'No Name Provided') AS name,
-                COALESCE(TRIM(jt.link), 'No Link Provided') AS linkedin_url,
-                COALESCE(TRIM(jt.industry), 'No Industry Provided') AS industry,
-                COALESCE(TRIM(jt.location), 'No Location Provided') AS location
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.similar_companies,
-                '$[*]'
-                COLUMNS (
-                   name VARCHAR(500) PATH '$.name',
-                   link VARCHAR(500) PATH '$.link',
-                   industry VARCHAR(500) PATH '$.industry',
-                   location VARCHAR(500) PATH '$.location'
-                )
-            ) AS jt
-            WHERE cr.similar_companies IS NOT NULL
-              AND TRIM(jt.name) <> ''
-        """
-        )
 
-        cursor.execute(
-            """
-            INSERT INTO similar_companies_junction (company_id, similar_companies_id)
-            SELECT DISTINCT
-                cr.company_id,
-                sc.similar_companies_id
-            FROM company cr
-            JOIN JSON_TABLE(
-                cr.similar_companies,
-                '$[*]'
-                COLUMNS (
-                   name VARCHAR(500) PATH '$.name',
-                   link VARCHAR(500) PATH '$.link',
-                   industry VARCHAR(500) PATH '$.industry',
-                   location VARCHAR(500) PATH '$.location'
-                )
-            ) AS jt
-            JOIN similar_companies sc 
-                ON sc.name         = COALESCE(TRIM(jt.name), 'No Name Provided')
-               AND sc.linkedin_url = COALESCE(TRIM(jt.link), 'No Link Provided')
-               AND sc.industry     = COALESCE(TRIM(jt.industry), 'No Industry Provided')
-               AND sc.location     = COALESCE(TRIM(jt.location), 'No Location Provided')
-            WHERE cr.similar_companies IS NOT NULL
-              AND TRIM(jt.name) <> ''
-        """
-        )
-        connection.commit()
+def drop_redundant_columns(connection, cursor):
+    """Phase 4: drop the source columns that have been normalized
 
-        # Phase 4: Cleanup
-        log_step("PHASE 4: Cleanup - removing redundant columns")
-        cursor.execute(
-            """
-            ALTER TABLE company 
-            DROP COLUMN industry,
-            DROP COLUMN hq,
-            DROP COLUMN company_type,
-            DROP COLUMN specialities,
-            DROP COLUMN locations,
-            DROP COLUMN similar_companies,
-            DROP COLUMN affiliated_companies,
-            DROP COLUMN updates,
-            DROP COLUMN company_size,
-            DROP COLUMN exit_data,
-            DROP COLUMN acquisitions,
-            DROP COLUMN extra,
-            DROP COLUMN funding_data,
-            DROP COLUMN categories,
-            DROP COLUMN customer_list
-        """
-        )
+    Each ALTER commits on its own, so a failed run can leave some tables
+    cleaned up; only the columns still present are dropped.
+    """
+    logging.info("PHASE 4: Cleanup - removing redundant columns")
+    schema = existing_schema(cursor)
+    for table, columns in (
+        ("company", REDUNDANT_COMPANY_COLUMNS),
+        ("affiliated_companies", ("location",)),
+        ("similar_companies", ("location",)),
+    ):
+        remaining = [column for column in columns if column in schema.get(table, ())]
+        if remaining:
+            drop_columns(cursor, table, remaining)
+        else:
+            logging.info(f"{table}: redundant columns already dropped")
 
-        cursor.execute("ALTER TABLE affiliated_companies DROP COLUMN location")
-        cursor.execute("ALTER TABLE similar_companies DROP COLUMN location")
-        connection.commit()
+    # The loader log only matters for resuming Phase 3
+    cursor.execute("DROP TABLE IF EXISTS _migration_log")
+    connection.commit()
 
-        log_step("Migration completed successfully")
 
+def run_migration():
+    # Load environment variables from .env file
+    load_dotenv()
+
+    # Read the password from an environment variable named PASSWORD
+    db_password = os.getenv("PASSWORD")
+    if not db_password:
+        raise ValueError("Database password not found in environment variables.")
+
+    logging.info("Starting database migration")
+
+    # use_pure=False quietly falls back to the pure Python protocol when the
+    # C extension is missing, so make the slower path visible
+    if not mysql.connector.HAVE_CEXT:
+        logging.warning("mysql-connector C extension not available, using the pure Python driver")
+
+    # Connect to MySQL
+    try:
+        db_pool = open_pool(db_password)
+        connection = open_connection(db_pool)
+        cursor = connection.cursor()
+        logging.info("Database connection established")
     except mysql.connector.Error as err:
-        log_step(f"ERROR: {err}")
+        logging.error(f"Database connection failed: {err}")
+        return
+
+    flush_log_at_trx_commit = None
+    try:
+        # Relax redo log flushing for the run; innodb_flush_log_at_trx_commit
+        # is global-only, so restore it afterwards
+        cursor.execute("SELECT @@GLOBAL.innodb_flush_log_at_trx_commit")
+        (saved_flush_log_at_trx_commit,) = cursor.fetchone()
+        cursor.execute("SET GLOBAL innodb_flush_log_at_trx_commit = 2")
+        flush_log_at_trx_commit = saved_flush_log_at_trx_commit
+        logging.info("Bulk-load session settings applied")
+
+        schema = existing_schema(cursor)
+        if "company" not in schema and "company_raw" not in schema:
+            logging.error(f"Neither company_raw nor company exists in {DATABASE}")
+            return
+
+        # The rename and the ALTER are separate statements, so a company table
+        # without company_id means an earlier run stopped between them
+        rebuilt = False
+        if "company_id" in schema.get("company", ()):
+            logging.info("PHASE 1: skipped, company already has its primary key")
+        else:
+            migrate_company(connection, cursor, rename="company" not in schema)
+            rebuilt = True
+
+        if all(table in schema for table in PHASE2_TABLES):
+            logging.info("PHASE 2: skipped, dimension and junction tables already exist")
+        else:
+            create_tables(connection, cursor)
+            rebuilt = True
+
+        # Loader records from an earlier migration do not describe freshly
+        # created tables, so they must not let Phase 3 skip any loads
+        if rebuilt:
+            cursor.execute("DROP TABLE IF EXISTS _migration_log")
+
+        # Phase 4 drops the JSON source columns, so once they are gone the
+        # load has already run; the cleanup itself checks each table
+        source_columns = schema.get("company") or schema["company_raw"]
+        if "specialities" not in source_columns:
+            logging.info("PHASE 3: skipped, source columns already dropped")
+        else:
+            load_data(connection, cursor, db_pool)
+        drop_redundant_columns(connection, cursor)
+
+        logging.info("Migration completed successfully")
+
+    # Malformed JSON payloads raise ValueError/TypeError/AttributeError from
+    # the parsers, so roll back and report those the same way
+    except (mysql.connector.Error, ValueError, TypeError, AttributeError) as err:
+        logging.error(err)
         connection.rollback()
-        log_step("Migration failed - rolling back changes")
+        logging.error("Migration failed - rolling back changes")
     finally:
-        cursor.close()
-        connection.close()
-        log_step("Database connection closed")
+        # A dropped connection must not hide the original error behind the
+        # restore's own, so log a failed restore instead of raising it
+        try:
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.execute("SET SESSION unique_checks = 1")
+            if flush_log_at_trx_commit is not None:
+                cursor.execute(
+                    "SET GLOBAL innodb_flush_log_at_trx_commit = %s", (flush_log_at_trx_commit,)
+                )
+            logging.info("Bulk-load session settings restored")
+        except mysql.connector.Error as err:
+            logging.error(f"Failed to restore bulk-load settings: {err}")
+            if flush_log_at_trx_commit is not None:
+                logging.error(
+                    f"Reset innodb_flush_log_at_trx_commit to {flush_log_at_trx_commit} manually"
+                )
+        try:
+            cursor.close()
+            connection.close()
+            logging.info("Database connection closed")
+        except mysql.connector.Error as err:
+            logging.error(f"Failed to close the database connection: {err}")
 
 
 if __name__ == "__main__":
-    print(f"Starting migration script at {time.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Current user: {os.getenv('USER', 'unknown')}")
+    logging.basicConfig(
+        format="[%(asctime)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        level=logging.INFO,
+    )
+    logging.info("Starting migration script")
+    logging.info(f"Current user: {os.getenv('USER', 'unknown')}")
 
     try:
         run_migration()
-        print("Script execution completed.")
+        logging.info("Script execution completed.")
     except Exception as e:
-        print(f"Script execution failed: {e}")
+        logging.error(f"Script execution failed: {e}")